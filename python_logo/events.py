@@ -1,6 +1,9 @@
-import contextlib
+import time
+from collections.abc import Iterator
 
 import eventlet
+from eventlet.greenthread import GreenThread
+from eventlet.queue import Empty, Full
 from flask import current_app as app
 from flask import request
 from flask_socketio import SocketIO
@@ -15,6 +18,10 @@ from .exceptions import (
 )
 from .utils import run
 
+_BATCH_SIZE = 64
+_BATCH_INTERVAL = 0.01
+_QUEUE_SIZE = 256
+
 workers = {}
 
 
@@ -32,20 +39,26 @@ class _Worker:
         self.socketio = socketio
         self.client_id = client_id
         self.code = code
+        self.logger = app.logger
         self._switch = True
+        self._buffer = []
+        self._flushed_at = time.monotonic()
+        self._done = eventlet.Event()
 
     def start(self) -> None:
         """Starts the Logo code execution and emits the commands to the client."""
+        try:
+            self._execute()
+        finally:
+            self._finish()
+
+    def _execute(self) -> None:
+        """Runs the Logo code and reports the task status to the client."""
         self.socketio.emit("task", {"status": "running"}, to=self.client_id)
-        eventlet.sleep(0.01)
+        eventlet.sleep(0)
 
         try:
-            logo_runner = run(self.code)
-            for command in logo_runner:
-                if not self._switch:
-                    break
-                self.socketio.emit("execute", command, to=self.client_id)
-                eventlet.sleep(0.01)
+            self._stream(run(self.code))
         except (
             InterpreterInvalidCommandError,
             InterpreterInvalidTreeError,
@@ -54,40 +67,124 @@ class _Worker:
             ParserInvalidCommandError,
             ParserUnexpectedTokenError,
         ) as err:
-            self._switch = False
-            self.socketio.emit(
-                "task",
-                {"status": "failed", "message": str(err)},
-                to=self.client_id,
-            )
-            eventlet.sleep(0.01)
+            self._fail(err)
             return
         except Exception as err:
-            self._switch = False
-            self.socketio.emit(
-                "task",
-                {"status": "failed", "message": str(err)},
-                to=self.client_id,
-            )
-            eventlet.sleep(0.01)
-            app.logger.exception()
+            self._fail(err)
+            self.logger.exception("Logo task failed.")
             return
 
-        self.stop()
+        # A stopped execution has already reported it is done
+        if self._switch:
+            self.stop()
+        else:
+            self._finish()
 
-    def is_running(self) -> bool:
-        """Returns whether the Logo code execution is running.
+    def _stream(self, commands: Iterator[dict]) -> None:
+        """Puts the interpreted commands on a bounded queue drained by a sender
+        greenlet. Yields to the hub every batch interval, so that the sender and
+        stop events run while the interpreter is busy.
+
+        Args:
+            commands (Iterator[dict]): The interpreted commands.
+        """
+        queue = eventlet.Queue(_QUEUE_SIZE)
+        sender = eventlet.spawn(self._send, queue)
+        try:
+            yielded_at = time.monotonic()
+            for command in commands:
+                if not self._switch or not self._put(queue, sender, command):
+                    break
+                if time.monotonic() - yielded_at >= _BATCH_INTERVAL:
+                    eventlet.sleep(0)
+                    yielded_at = time.monotonic()
+        finally:
+            self._put(queue, sender, None)
+            sender.wait()
+
+    @staticmethod
+    def _put(queue: eventlet.Queue, sender: GreenThread, item: dict | None) -> bool:
+        """Puts an item on the queue unless the sender greenlet has died.
+
+        Args:
+            queue (eventlet.Queue): The queue of interpreted commands.
+            sender (GreenThread): The greenlet draining the queue.
+            item (dict | None): The command, or None to end the stream.
 
         Returns:
-            bool: True if the code execution is running, False otherwise.
+            bool: Whether the item was put on the queue.
         """
-        return self._switch
+        while not sender.dead:
+            try:
+                queue.put(item, timeout=_BATCH_INTERVAL)
+            except Full:
+                continue
+            return True
+        return False
+
+    def _fail(self, err: Exception) -> None:
+        """Stops the Logo code execution and reports the error to the client.
+
+        Args:
+            err (Exception): The error that made the execution fail.
+        """
+        self._switch = False
+        self.socketio.emit(
+            "task",
+            {"status": "failed", "message": str(err)},
+            to=self.client_id,
+        )
+        eventlet.sleep(0)
+
+    def _send(self, queue: eventlet.Queue) -> None:
+        """Drains the queue of interpreted commands and emits them in batches.
+        Runs in its own greenlet until None is taken from the queue.
+
+        Args:
+            queue (eventlet.Queue): The queue of interpreted commands.
+        """
+        while True:
+            try:
+                command = queue.get(timeout=_BATCH_INTERVAL if self._buffer else None)
+            except Empty:
+                self._flush()
+                continue
+
+            if command is None:
+                break
+            self._buffer.append(command)
+            if (
+                len(self._buffer) >= _BATCH_SIZE
+                or time.monotonic() - self._flushed_at >= _BATCH_INTERVAL
+            ):
+                self._flush()
+        self._flush()
+
+    def _flush(self) -> None:
+        """Emits the buffered commands to the client as a single batch.
+        Commands buffered after the execution was stopped are dropped.
+        """
+        buffer, self._buffer = self._buffer, []
+        if buffer and self._switch:
+            self.socketio.emit("execute_batch", buffer, to=self.client_id)
+            eventlet.sleep(0)
+        self._flushed_at = time.monotonic()
+
+    def wait(self) -> None:
+        """Blocks until the Logo code execution has finished or failed."""
+        self._done.wait()
 
     def stop(self) -> None:
         """Stops the Logo code execution."""
         self._switch = False
         self.socketio.emit("task", {"status": "done"}, to=self.client_id)
-        eventlet.sleep(0.01)
+        eventlet.sleep(0)
+        self._finish()
+
+    def _finish(self) -> None:
+        """Wakes up everyone waiting for the Logo code execution to finish."""
+        if not self._done.ready():
+            self._done.send()
 
 
 def register_events(socketio: SocketIO) -> None:
@@ -105,8 +202,9 @@ def register_events(socketio: SocketIO) -> None:
     @socketio.on("disconnect")
     def on_disconnect() -> None:
         """Event handler for when a client disconnects."""
-        with contextlib.suppress(KeyError):
-            del workers[request.sid]
+        worker = workers.pop(request.sid, None)
+        if worker is not None:
+            worker.stop()
         app.logger.info("Client with IP %s has disconnected.", request.remote_addr)
 
     @socketio.on("run")
@@ -117,6 +215,10 @@ def register_events(socketio: SocketIO) -> None:
         Args:
             code (str): The Logo code to run.
         """
+        # A client runs one task at a time, so a new run replaces the old one
+        previous = workers.pop(request.sid, None)
+        if previous is not None:
+            previous.stop()
         worker = _Worker(socketio, request.sid, code)
         workers[request.sid] = worker
 
@@ -124,11 +226,10 @@ def register_events(socketio: SocketIO) -> None:
             "Starting Logo task for client with IP %s.", request.remote_addr
         )
         socketio.start_background_task(worker.start)
+        worker.wait()
 
-        while worker.is_running():
-            eventlet.sleep(0.1)
-
-        with contextlib.suppress(KeyError):
+        # A newer run may have replaced this worker in the meantime
+        if workers.get(request.sid) is worker:
             del workers[request.sid]
         app.logger.info(
             "Logo task for client with IP %s has finished.", request.remote_addr
@@ -137,10 +238,9 @@ def register_events(socketio: SocketIO) -> None:
     @socketio.on("stop")
     def on_stop() -> None:
         """Event handler for when a client sends a stop event."""
-        if request.sid in workers:
+        worker = workers.pop(request.sid, None)
+        if worker is not None:
             app.logger.info(
                 "Stopping Logo task for client with IP %s.", request.remote_addr
             )
-            workers[request.sid].stop()
-            with contextlib.suppress(KeyError):
-                del workers[request.sid]
+            worker.stop()
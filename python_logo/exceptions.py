@@ -127,7 +127,11 @@ class InterpreterInvalidFunctionArgumentsError(Exception):
     )
 
     def __init__(
-        self, func_name: str, expected_args: int, received_args: int, message: str
+        self,
+        func_name: str,
+        expected_args: int,
+        received_args: int,
+        message: str | None = None,
     ) -> None:
         """Initializes the error.
 
@@ -148,7 +152,7 @@ class InterpreterFunctionExecutionError(Exception):
 
     default_message = "Execution of function '%s' failed: %s."
 
-    def __init__(self, func_name: str, reason: str, message: str) -> None:
+    def __init__(self, func_name: str, reason: str, message: str | None = None) -> None:
         """
         Initializes the error.
 
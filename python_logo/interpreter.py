@@ -1,4 +1,6 @@
-from collections.abc import Generator, Iterator
+import itertools
+import operator
+from collections.abc import Callable, Generator, Iterator
 
 from .exceptions import (
     InterpreterFunctionExecutionError,
@@ -11,22 +13,50 @@ from .exceptions import (
     InterpreterUndefinedFunctionError,
 )
 
+_MISSING = object()
+
+# Instruction tags of compiled expressions
+_LIT, _VAR, _BIN, _UN, _LIST, _BOOL = range(6)
+# Extra tasks used only while compiling
+_NODE, _BOOL_END = range(6, 8)
+
+_BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "^": operator.pow,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    "<>": operator.ne,
+}
+
 
 class Interpreter:
     """Class to interpret parsed Logo programming language commands.
     Interpreted commands include only commands that affects the turtle directly.
     It doesn't include variables, functions or commands that are used for control flow.
+    The tree is only read, so the same tree can be interpreted any number of times.
 
     Args:
         tree (dict): Parsed Logo tree with parse() function.
     """
 
+    _SUPPORTED_COLORS = ("white", "black", "red", "green", "blue", "cyan")
+    _COLORS = frozenset(_SUPPORTED_COLORS)
+
     def __init__(self, tree: dict) -> None:
         """Initializes the Interpreter instance."""
         self._variables = {}
-        self._fuctions = {}
+        self._functions = {}
         self._lists = {}
-        self._colors = ["white", "black", "red", "green", "blue", "cyan"]
+        self._scopes = []
+        self._eval_cache = {}
+        self._vars_version = 0
+        self._program = None
         try:
             self._commands = tree["tokens"]
         except KeyError as err:
@@ -40,286 +70,432 @@ class Interpreter:
         Returns:
             Iterator[dict]: Iterator of commands.
         """
-        return self._interpret(self._commands)
+        return self._interpret()
+
+    def _interpret(self) -> Generator[dict, None, None]:
+        """Compiles the commands on the first iteration and interprets them.
+        The compiled program is kept, so the evaluation cache, which is keyed by
+        the identity of compiled expressions, stays valid between iterations.
+
+        Returns:
+            Generator[dict, None, None]: Generator of commands.
+        """
+        if self._program is None:
+            self._program = self._compile(self._commands)
+        yield from self._run(self._program)
 
-    def _interpret(self, commands: list) -> Generator[dict, None, None]:  # noqa: C901, PLR0912
-        """Generates and interprets commands.
+    def _run(self, program: list) -> Generator[dict, None, None]:
+        """Runs compiled commands.
 
         Args:
-            commands (list): List of parsed commands.
+            program (list): List of compiled commands.
 
         Returns:
             Generator[dict, None, None]: Generator of commands.
         """
+        for handler, args in program:
+            commands = handler(args)
+            if commands is not None:
+                yield from commands
+
+    # --------------------------------------------------------------------------
+    # Compilation
+    # --------------------------------------------------------------------------
+
+    def _compile(self, commands: list) -> list[tuple[Callable, tuple]]:
+        """Compiles parsed commands into handlers paired with their arguments.
+
+        Args:
+            commands (list): List of parsed commands.
+
+        Returns:
+            list[tuple[Callable, tuple]]: List of compiled commands.
+        """
         try:
-            for command in commands:
-                name = command["name"]
-                match name:
-                    case "func_def":
-                        self._handle_func_def(command)
-                    case "func_call":
-                        yield from self._handle_func_call(command)
-                    case "make":
-                        self._handle_make(command)
-                    case "list_make":
-                        self._handle_list_make(command)
-                    case "list":
-                        self._handle_list(command)
-                    case "repeat":
-                        yield from self._handle_repeat(command)
-                    case "if":
-                        yield from self._handle_if(command)
-                    case "forward" | "backward" | "left" | "right":
-                        yield from self._handle_movement(command)
-                    case "hideturtle" | "showturtle" | "penup" | "pendown":
-                        yield command
-                    case "setpos":
-                        command["x"] = self._evaluate(command["x"])
-                        command["y"] = self._evaluate(command["y"])
-                        yield command
-                    case "setpencolor":
-                        yield from self._handle_setpencolor(command)
-                    case "setpensize":
-                        yield from self._handle_setpensize(command)
-                    case "print":
-                        yield from self._handle_print(command)
-                    case _:
-                        raise InterpreterInvalidCommandError
+            return [self._compile_command(command) for command in commands]
         except KeyError as err:
             raise InterpreterInvalidTreeError from err
 
+    def _compile_command(self, command: dict) -> tuple[Callable, tuple]:  # noqa: C901, PLR0911, PLR0912
+        """Compiles a single parsed command."""
+        name = command["name"]
+        match name:
+            case "func_def":
+                return self._handle_func_def, (
+                    command["func_name"],
+                    tuple(command["arguments"]),
+                    self._compile(command["commands"]),
+                )
+            case "func_call":
+                return self._handle_func_call, (
+                    command["func_name"],
+                    [self._compile_expr(arg) for arg in command["arguments"]],
+                )
+            case "make":
+                return self._handle_make, (
+                    command["var_name"],
+                    self._compile_expr(command["value"]),
+                )
+            case "list_make":
+                value = command["list"]
+                items = [] if value == "empty" else value
+                return self._handle_list_make, (
+                    command["list_name"],
+                    [self._compile_expr(item) for item in items],
+                )
+            case "list":
+                return self._handle_list_command, self._compile_list(command)
+            case "repeat":
+                return self._handle_repeat, (
+                    self._compile_expr(command["value"]),
+                    self._compile(command["commands"]),
+                )
+            case "if":
+                return self._handle_if, (
+                    self._compile_expr(command["condition"]),
+                    self._compile(command["commands"]),
+                    self._compile(command["else_commands"]),
+                )
+            case "forward" | "backward" | "left" | "right":
+                return self._handle_movement, (
+                    name,
+                    self._compile_expr(command["value"]),
+                )
+            case "hideturtle" | "showturtle" | "penup" | "pendown":
+                return self._handle_turtle_state, (name,)
+            case "setpos":
+                return self._handle_setpos, (
+                    self._compile_expr(command["x"]),
+                    self._compile_expr(command["y"]),
+                )
+            case "setpencolor":
+                return self._handle_setpencolor, (command["color"],)
+            case "setpensize":
+                return self._handle_setpensize, (self._compile_expr(command["value"]),)
+            case "print":
+                return self._handle_print, (self._compile_expr(command["value"]),)
+            case _:
+                raise InterpreterInvalidCommandError
+
+    def _compile_list(self, command: dict) -> tuple:
+        """Compiles 'list' commands to the arguments of the list handler."""
+        index = command.get("index")
+        value = command.get("value")
+        return (
+            command["function"],
+            command["list_name"],
+            None if index is None else self._compile_expr(index),
+            None if value is None else self._compile_expr(value),
+        )
+
     # --------------------------------------------------------------------------
     # Handlers for specific commands
     # --------------------------------------------------------------------------
 
-    def _handle_func_def(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_func_def(self, args: tuple) -> None:
         """Handles function definition commands."""
-        func_name = command["func_name"]
-        arguments = command["arguments"]
-        commands = command["commands"]
-
-        self._fuctions[func_name] = {"arguments": {}, "commands": []}
-        for argument in arguments:
-            self._fuctions[func_name]["arguments"][argument] = ""
-        self._fuctions[func_name]["commands"] = commands
+        func_name, params, commands = args
+        self._functions[func_name] = {"params": params, "commands": commands}
 
-    def _handle_func_call(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_func_call(self, args: tuple) -> Generator[dict, None, None]:
         """Handles function call commands."""
-        func_name = command["func_name"]
-        arguments = command["arguments"]
+        func_name, arguments = args
+
+        function = self._functions.get(func_name)
+        if function is None:
+            raise InterpreterUndefinedFunctionError(func_name)
+        params = function["params"]
+        commands = function["commands"]
+
+        if len(params) != len(arguments):
+            raise InterpreterInvalidFunctionArgumentsError(
+                func_name=func_name,
+                expected_args=len(params),
+                received_args=len(arguments),
+            )
+        frame = {
+            param: self._evaluate(argument)
+            for param, argument in zip(params, arguments, strict=True)
+        }
 
+        self._scopes.append(frame)
+        self._vars_version += 1
         try:
-            func_args_num = len(self._fuctions[func_name]["arguments"])
-            input_args_num = len(arguments)
-
-            if func_args_num != input_args_num:
-                raise InterpreterInvalidFunctionArgumentsError(
-                    func_name=func_name,
-                    expected_args=func_args_num,
-                    received_args=input_args_num,
-                )
-
-            keys = list(self._fuctions[func_name]["arguments"])
-            for i in range(len(arguments)):
-                arg_name = keys[i]
-                evaluated_value = self._evaluate(arguments[i])
-                self._fuctions[func_name]["arguments"][arg_name] = evaluated_value
-
-            commands = self._fuctions[func_name]["commands"]
-            try:
-                yield from self._interpret(commands)
-            except Exception as execution_err:
-                raise InterpreterFunctionExecutionError(
-                    func_name, str(execution_err)
-                ) from execution_err
-
-        except KeyError as err:
-            raise InterpreterUndefinedFunctionError(func_name) from err
-
-    def _handle_make(self, command: dict) -> Generator[dict, None, None]:
+            yield from self._run(commands)
+        except Exception as execution_err:
+            raise InterpreterFunctionExecutionError(
+                func_name, str(execution_err)
+            ) from execution_err
+        finally:
+            self._scopes.pop()
+            self._vars_version += 1
+
+    def _handle_make(self, args: tuple) -> None:
         """Handles 'make' commands (variable assignment)."""
-        var_name = command["var_name"]
-        value = self._evaluate(command["value"])
-        self._variables[var_name] = value
+        var_name, value = args
+        self._variables[var_name] = self._evaluate(value)
+        self._vars_version += 1
 
-    def _handle_list_make(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_list_make(self, args: tuple) -> None:
         """Handles 'list_make' commands (list creation)."""
-        list_name = command["list_name"]
-        value = command["list"]
-        if value == "empty":
-            value = []
-        for i in range(len(value)):
-            value[i] = self._evaluate(value[i])
-        self._lists[list_name] = value
-
-    def _handle_repeat(self, command: dict) -> Generator[dict, None, None]:
-        """Handles 'repeat' commands."""
-        value = self._evaluate(command["value"])
-        for _ in range(int(value)):
-            yield from self._interpret(command["commands"])
+        list_name, items = args
+        self._lists[list_name] = [self._evaluate(item) for item in items]
+        self._vars_version += 1
 
-    def _handle_if(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_repeat(self, args: tuple) -> Generator[dict, None, None]:
+        """Handles 'repeat' commands."""
+        value, program = args
+        count = int(self._evaluate(value))
+        for _ in itertools.repeat(None, count):
+            for handler, handler_args in program:
+                commands = handler(handler_args)
+                if commands is not None:
+                    yield from commands
+
+    def _handle_if(self, args: tuple) -> Generator[dict, None, None]:
         """Handles 'if' commands."""
-        condition = self._evaluate(command["condition"])
-        if condition:
-            yield from self._interpret(command["commands"])
+        condition, commands, else_commands = args
+        if self._evaluate(condition):
+            yield from self._run(commands)
         else:
-            yield from self._interpret(command["else_commands"])
+            yield from self._run(else_commands)
 
-    def _handle_movement(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_movement(self, args: tuple) -> Generator[dict, None, None]:
         """Handles movement commands like forward, backward, left, right."""
-        new_command = {
-            "name": command["name"],
-            "value": self._evaluate(command["value"]),
-        }
-        yield new_command
+        name, value = args
+        yield {"name": name, "value": self._evaluate(value)}
 
-    def _handle_setpencolor(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_turtle_state(self, args: tuple) -> Generator[dict, None, None]:
+        """Handles commands like hideturtle, showturtle, penup, pendown."""
+        (name,) = args
+        yield {"name": name}
+
+    def _handle_setpos(self, args: tuple) -> Generator[dict, None, None]:
+        """Handles 'setpos' commands."""
+        x, y = args
+        yield {"name": "setpos", "x": self._evaluate(x), "y": self._evaluate(y)}
+
+    def _handle_setpencolor(self, args: tuple) -> Generator[dict, None, None]:
         """Handles 'setpencolor' commands."""
-        if command["color"] not in self._colors:
+        (color,) = args
+        if color not in self._COLORS:
             raise InterpreterInvalidColorError(
-                color=command["color"],
-                supported_colors=self._colors,
+                color=color,
+                supported_colors=list(self._SUPPORTED_COLORS),
             )
-        yield command
+        yield {"name": "setpencolor", "color": color}
 
-    def _handle_setpensize(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_setpensize(self, args: tuple) -> Generator[dict, None, None]:
         """Handles 'setpensize' commands."""
-        new_command = {
-            "name": command["name"],
-            "value": self._evaluate(command["value"]),
-        }
-        yield new_command
+        (value,) = args
+        yield {"name": "setpensize", "value": self._evaluate(value)}
 
-    def _handle_print(self, command: dict) -> Generator[dict, None, None]:
+    def _handle_print(self, args: tuple) -> Generator[dict, None, None]:
         """Handles 'print' commands."""
-        new_command = {
-            "name": command["name"],
-            "value": self._evaluate(command["value"]),
-        }
-        yield new_command
-
-    def _handle_list(self, command: dict) -> Generator[dict, None, None]:
-        """Handles 'list' commands."""
-        try:
-            if command["list_name"] in self._lists:
-                xs = self._lists[command["list_name"]]
-            match command["function"]:
-                case "empty":
-                    return bool(not xs)
-                case "len":
-                    return len(xs)
-                case "get":
-                    i = int(self._evaluate(command["index"]))
-                    return xs[i]
-                case "set":
-                    xs[int(command["index"])] = self._evaluate(command["value"])
-                    self._lists[command["list_name"]] = xs
-                case "insert":
-                    xs.insert(int(command["index"]), self._evaluate(command["value"]))
-                    self._lists[command["list_name"]] = xs
-                case "remove":
-                    xs.pop(int(command["index"]))
-                    self._lists[command["list_name"]] = xs
-                case "remove_value":
-                    xs.remove(self._evaluate(command["value"]))
-                    self._lists[command["list_name"]] = xs
-                case _:
-                    raise InterpreterInvalidCommandError
-        except KeyError as err:
-            raise InterpreterUnboundVariableListError from err
+        (value,) = args
+        yield {"name": "print", "value": self._evaluate(value)}
+
+    def _handle_list_command(self, args: tuple) -> None:
+        """Handles 'list' commands used as statements."""
+        self._handle_list(args)
+
+    def _handle_list(self, args: tuple) -> float | bool | None:
+        """Handles 'list' commands and returns the result of list queries."""
+        function, list_name, index, value = args
+        xs = self._lists.get(list_name)
+        if xs is None:
+            raise InterpreterUnboundVariableListError(list_name)
+
+        match function:
+            case "empty":
+                return not xs
+            case "len":
+                return len(xs)
+            case "get":
+                return xs[int(self._evaluate(index))]
+            case "set":
+                xs[int(self._evaluate(index))] = self._evaluate(value)
+            case "insert":
+                xs.insert(int(self._evaluate(index)), self._evaluate(value))
+            case "remove":
+                xs.pop(int(self._evaluate(index)))
+            case "remove_value":
+                xs.remove(self._evaluate(value))
+            case _:
+                raise InterpreterInvalidCommandError
+        self._vars_version += 1
+        return None
 
     # --------------------------------------------------------------------------
     # Expression evaluation
     # --------------------------------------------------------------------------
 
-    def _evaluate(self, value: float | str | dict) -> float:  # noqa: PLR0912, PLR0911, C901
-        """Evaluates the value of the possible variable or expression."""
-        # Value is a float
-        if isinstance(value, float):
-            return value
-
-        # Value is a string -> could be a variable
-        if isinstance(value, str):
-            # Try local function arguments first
-            for func_data in self._fuctions.values():
-                if value in func_data["arguments"]:
-                    return func_data["arguments"][value]
-
-            if value == "true":
-                return True
-            if value == "false":
-                return False
-
-            # Then try global variables
-            try:
-                return self._variables[value]
-            except KeyError as err:
-                raise InterpreterUnboundVariableError(value) from err
-
-        # Value is an expression (dict)
-        if isinstance(value, dict):
-            if "name" in value and value["name"] == "list":
-                return self._handle_list(value)
+    def _compile_expr(self, value: float | str | dict) -> tuple:
+        """Compiles the possible variable or expression into postfix instructions.
+
+        Expressions that don't depend on variables or lists are folded into
+        a single literal.
+        """
+        code = []
+        constant = self._compile_node(value, code)
+        if constant and len(code) > 1:
             try:
-                op = value["op"]
-                match op:
-                    case "+":
-                        return self._evaluate(value["left"]) + self._evaluate(
-                            value["right"]
-                        )
-                    case "-":
-                        return self._evaluate(value["left"]) - self._evaluate(
-                            value["right"]
-                        )
-                    case "*":
-                        return self._evaluate(value["left"]) * self._evaluate(
-                            value["right"]
-                        )
-                    case "/":
-                        return self._evaluate(value["left"]) / self._evaluate(
-                            value["right"]
-                        )
-                    case "^":
-                        return self._evaluate(value["left"]) ** self._evaluate(
-                            value["right"]
-                        )
+                return ((_LIT, self._execute(code)),)
+            except ArithmeticError:
+                # Leave the error to be raised when the expression is evaluated
+                pass
+        return tuple(code)
+
+    def _compile_node(self, value: float | str | dict, code: list) -> bool:  # noqa: C901, PLR0912, PLR0915
+        """Appends postfix instructions of the expression node to the code.
+        Nodes are visited with an explicit work stack, so deeply nested
+        expressions don't exhaust the Python stack.
+
+        Returns:
+            bool: Whether the node is constant.
+        """
+        # Constness of the compiled nodes, consumed by their parents
+        constants = []
+        work = [(_NODE, value)]
+        try:
+            while work:
+                task, arg = work.pop()
+                if task == _UN:
+                    code.append((_UN, arg))
+                    continue
+                if task == _BIN:
+                    code.append((_BIN, arg))
+                    right_constant = constants.pop()
+                    constants[-1] = constants[-1] and right_constant
+                    continue
+                if task == _BOOL:
+                    # Operands jump to the end as soon as one of them decides
+                    jumps = arg
+                    jumps.append(len(code))
+                    code.append((_BOOL, None))
+                    continue
+                if task == _BOOL_END:
+                    short, jumps, count = arg
+                    code.append((_LIT, not short))
+                    for jump in jumps:
+                        code[jump] = (_BOOL, (short, len(code)))
+                    constant = all(constants[len(constants) - count :])
+                    del constants[len(constants) - count :]
+                    constants.append(constant)
+                    continue
+
+                node = arg
+                # Value is a float
+                if isinstance(node, float):
+                    code.append((_LIT, node))
+                    constants.append(True)
+                    continue
+
+                # Value is a string -> could be a variable
+                if isinstance(node, str):
+                    code.append((_VAR, node))
+                    constants.append(False)
+                    continue
+
+                # If it's not an expression (dict), it's an invalid tree
+                if not isinstance(node, dict):
+                    raise InterpreterInvalidTreeError
+
+                if node.get("name") == "list":
+                    code.append((_LIST, self._compile_list(node)))
+                    constants.append(False)
+                    continue
+
+                match node["op"]:
                     case "neg":
-                        return -self._evaluate(value["value"])
-                    case ">":
-                        return self._evaluate(value["left"]) > self._evaluate(
-                            value["right"]
-                        )
-                    case ">=":
-                        return self._evaluate(value["left"]) >= self._evaluate(
-                            value["right"]
-                        )
-                    case "<":
-                        return self._evaluate(value["left"]) < self._evaluate(
-                            value["right"]
-                        )
-                    case "<=":
-                        return self._evaluate(value["left"]) <= self._evaluate(
-                            value["right"]
-                        )
-                    case "=":
-                        return self._evaluate(value["left"]) == self._evaluate(
-                            value["right"]
-                        )
-                    case "<>":
-                        return self._evaluate(value["left"]) != self._evaluate(
-                            value["right"]
-                        )
-                    case "and":
-                        return all(self._evaluate(expr) for expr in value["list"])
-                    case "or":
-                        return any(self._evaluate(expr) for expr in value["list"])
+                        work.append((_UN, operator.neg))
+                        work.append((_NODE, node["value"]))
                     case "not":
-                        return not self._evaluate(value["expr"])
+                        work.append((_UN, operator.not_))
+                        work.append((_NODE, node["expr"]))
+                    case "and" | "or" as op:
+                        exprs = node["list"]
+                        jumps = []
+                        work.append((_BOOL_END, (op == "or", jumps, len(exprs))))
+                        for expr in reversed(exprs):
+                            work.append((_BOOL, jumps))
+                            work.append((_NODE, expr))
+                    case op if op in _BINARY_OPERATORS:
+                        work.append((_BIN, _BINARY_OPERATORS[op]))
+                        work.append((_NODE, node["right"]))
+                        work.append((_NODE, node["left"]))
                     case _:
                         raise InterpreterInvalidCommandError
-            except KeyError as err:
-                raise InterpreterInvalidTreeError from err
+        except KeyError as err:
+            raise InterpreterInvalidTreeError from err
+        return constants[0]
+
+    def _evaluate(self, code: tuple) -> float:
+        """Evaluates the compiled expression, reusing the previous result when possible.
 
-        # If none of the above matched, it's an invalid tree
-        raise InterpreterInvalidTreeError
+        Results are cached by the expression's identity together with the version
+        of the bindings they were computed with.
+        """
+        # Literals and plain variables are cheaper to read than the cache
+        if len(code) == 1:
+            op, arg = code[0]
+            if op == _LIT:
+                return arg
+            if op == _VAR:
+                return self._resolve(arg)
+
+        key = id(code)
+        cached = self._eval_cache.get(key)
+        if cached is not None and cached[0] == self._vars_version:
+            return cached[1]
+
+        result = self._execute(code)
+        self._eval_cache[key] = (self._vars_version, result)
+        return result
+
+    def _execute(self, code: tuple | list) -> float:
+        """Executes postfix instructions of the expression on an operand stack."""
+        stack = []
+        pc = 0
+        end = len(code)
+        while pc < end:
+            op, arg = code[pc]
+            pc += 1
+            if op == _LIT:
+                stack.append(arg)
+            elif op == _VAR:
+                stack.append(self._resolve(arg))
+            elif op == _BIN:
+                right = stack.pop()
+                stack[-1] = arg(stack[-1], right)
+            elif op == _UN:
+                stack[-1] = arg(stack[-1])
+            elif op == _LIST:
+                stack.append(self._handle_list(arg))
+            elif op == _BOOL:
+                short, target = arg
+                if bool(stack[-1]) == short:
+                    stack[-1] = short
+                    pc = target
+                else:
+                    stack.pop()
+        return stack[0]
+
+    def _resolve(self, value: str) -> float:
+        """Resolves the value of the variable."""
+        # Try arguments of the active function calls first, innermost to outermost
+        for scope in reversed(self._scopes):
+            result = scope.get(value, _MISSING)
+            if result is not _MISSING:
+                return result
+
+        if value == "true":
+            return True
+        if value == "false":
+            return False
+
+        # Then try global variables
+        result = self._variables.get(value, _MISSING)
+        if result is _MISSING:
+            raise InterpreterUnboundVariableError(value)
+        return result
@@ -1,3 +1,5 @@
+import sys
+
 import lark.exceptions
 from lark import Lark, Transformer, v_args
 
@@ -100,11 +102,11 @@ class _LogoJsonTransformer(Transformer):
 
     @v_args(inline=True)
     def var_name(self, value: str) -> str:
-        return str(value)
+        return sys.intern(str(value))
 
     @v_args(inline=True)
     def func_name(self, value: str) -> str:
-        return str(value)
+        return sys.intern(str(value))
 
     @v_args(inline=True)
     def color(self, value: str) -> str:
@@ -112,7 +114,7 @@ class _LogoJsonTransformer(Transformer):
 
     @v_args(inline=True)
     def variable(self, value: str) -> str:
-        return str(value)
+        return sys.intern(str(value))
 
     def add(self, items: list) -> dict:
         return {"op": "+", "left": items[0], "right": items[1]}
@@ -293,8 +295,12 @@ class _LogoJsonTransformer(Transformer):
         return {"name": "func_call", "func_name": items[0], "arguments": items[1:]}
 
 
+_PARSER = Lark(_LOGO_GRAMMAR, parser="lalr", transformer=_LogoJsonTransformer())
+
+
 def parse(code: str) -> dict:
     """Parses the given Logo code and returns its JSON representation.
+    The returned tree is read-only for the interpreter and can be reused.
 
     Args:
         code (str): The Logo code to be parsed.
@@ -306,10 +312,8 @@ def parse(code: str) -> dict:
     if code == "":
         return {"tokens": []}
 
-    parser = Lark(_LOGO_GRAMMAR, parser="lalr", transformer=_LogoJsonTransformer())
-
     try:
-        return parser.parse(code)
+        return _PARSER.parse(code)
     except lark.exceptions.UnexpectedCharacters as err:
         raise ParserInvalidCommandError from err
     except lark.exceptions.UnexpectedToken as err:
@@ -1,6 +1,34 @@
+import hashlib
+from collections import OrderedDict
+
 from .interpreter import Interpreter
 from .parser import parse
 
+_PARSE_CACHE_SIZE = 64
+_PARSE_CACHE_MAX_CODE_LENGTH = 10_000
+
+_parse_cache = OrderedDict()
+
+
+def _parse(code: str) -> dict:
+    """Parses Logo code, reusing trees of recently run code.
+    Trees are cached by a digest of the code, and long code isn't cached at all.
+    """
+    if len(code) > _PARSE_CACHE_MAX_CODE_LENGTH:
+        return parse(code)
+
+    key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    tree = _parse_cache.get(key)
+    if tree is not None:
+        _parse_cache.move_to_end(key)
+        return tree
+
+    tree = parse(code)
+    _parse_cache[key] = tree
+    if len(_parse_cache) > _PARSE_CACHE_SIZE:
+        _parse_cache.popitem(last=False)
+    return tree
+
 
 def run(code: str) -> Interpreter:
     """Runs Logo parser and interpreter.
@@ -11,5 +39,5 @@ def run(code: str) -> Interpreter:
     Returns:
         Interpreter: The interpreter class with an iterator to obtain the commands.
     """
-    tree = parse(code)
+    tree = _parse(code)
     return Interpreter(tree)
@@ -1,4 +1,14 @@
-from python_logo import run
+import copy
+
+import pytest
+
+from python_logo import Interpreter, parse, run, utils
+from python_logo.exceptions import (
+    InterpreterInvalidFunctionArgumentsError,
+    InterpreterUnboundVariableListError,
+    InterpreterUndefinedFunctionError,
+)
+from python_logo.utils import _PARSE_CACHE_SIZE, _parse_cache
 
 
 def test_showturtle():
@@ -136,3 +146,182 @@ def test_expr():
         {"name": "forward", "value": 100.5},
     ]
     assert list(run(expr_input)) == expr_response
+
+
+def test_expr_deeply_nested():
+    terms = " + 1" * 5000
+    nested_input = f"make a 1 forward 1{terms} forward :a{terms}"
+    nested_response = [
+        {"name": "forward", "value": 5001.0},
+        {"name": "forward", "value": 5001.0},
+    ]
+    assert list(run(nested_input)) == nested_response
+
+
+def test_repeat_make():
+    repeat_make_input = "make a 1 repeat 3 [forward :a * 2 make a :a + 1]"
+    repeat_make_response = [
+        {"name": "forward", "value": 2.0},
+        {"name": "forward", "value": 4.0},
+        {"name": "forward", "value": 6.0},
+    ]
+    assert list(run(repeat_make_input)) == repeat_make_response
+
+
+def test_func():
+    func_input = """
+    to tree :size
+        if :size > 0 [forward :size tree :size - 1 backward :size]
+    end
+    tree 2
+    """
+    func_response = [
+        {"name": "forward", "value": 2.0},
+        {"name": "forward", "value": 1.0},
+        {"name": "backward", "value": 1.0},
+        {"name": "backward", "value": 2.0},
+    ]
+    assert list(run(func_input)) == func_response
+
+
+def test_func_dynamic_scope():
+    func_input = """
+    to outer :x :y inner 2 forward :y end
+    to inner :y forward :x + :y end
+    outer 1 10
+    """
+    func_response = [
+        {"name": "forward", "value": 3.0},
+        {"name": "forward", "value": 10.0},
+    ]
+    assert list(run(func_input)) == func_response
+
+
+def test_func_invalid_arguments():
+    func_input = "to square :size :angle forward :size right :angle end square 10"
+    with pytest.raises(InterpreterInvalidFunctionArgumentsError):
+        list(run(func_input))
+
+
+def test_func_undefined():
+    with pytest.raises(InterpreterUndefinedFunctionError):
+        list(run("square 10 to square :size forward :size end"))
+
+
+def test_expr_unused_branch():
+    unused_branch_input = "if false [forward 1 / 0] else [forward 2 ^ 3]"
+    unused_branch_response = [{"name": "forward", "value": 8.0}]
+    assert list(run(unused_branch_input)) == unused_branch_response
+
+
+def test_tree_reuse():
+    tree_input = """
+    list xs [1 2]
+    insert :xs 0 3
+    setpos get :xs 0 len :xs
+    """
+    tree_response = [{"name": "setpos", "x": 3.0, "y": 3}]
+    tree = parse(tree_input)
+    tree_copy = copy.deepcopy(tree)
+    assert list(Interpreter(tree)) == tree_response
+    assert tree == tree_copy
+    assert list(Interpreter(tree)) == tree_response
+
+
+def test_list():
+    list_input = """
+    list xs [1 2 + 3 4]
+    list ys []
+    set :xs 0 10
+    insert :xs 1 20
+    remove :xs 3
+    remove_value :xs 5
+    forward get :xs 0
+    forward get :xs 1
+    forward len :xs
+    print [empty :ys]
+    """
+    list_response = [
+        {"name": "forward", "value": 10.0},
+        {"name": "forward", "value": 20.0},
+        {"name": "forward", "value": 2},
+        {"name": "print", "value": True},
+    ]
+    assert list(run(list_input)) == list_response
+
+
+def test_list_unbound():
+    with pytest.raises(InterpreterUnboundVariableListError):
+        list(run("forward len :xs"))
+    with pytest.raises(InterpreterUnboundVariableListError):
+        list(run("insert :xs 0 1"))
+
+
+def test_logic_short_circuit():
+    short_circuit_input = """
+    make zero 0
+    print [AND [:zero 1 / 0 > 0]]
+    print [OR [:zero + 1 1 / 0 > 0]]
+    print [AND []]
+    print [OR []]
+    """
+    short_circuit_response = [
+        {"name": "print", "value": False},
+        {"name": "print", "value": True},
+        {"name": "print", "value": True},
+        {"name": "print", "value": False},
+    ]
+    assert list(run(short_circuit_input)) == short_circuit_response
+
+
+def test_interpreter_reuse():
+    interpreter = Interpreter(parse("print [:true + 1] print [:true * 5]"))
+    interpreter_response = [
+        {"name": "print", "value": 2.0},
+        {"name": "print", "value": 5.0},
+    ]
+    assert list(interpreter) == interpreter_response
+    assert list(interpreter) == interpreter_response
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    _parse_cache.clear()
+    calls = []
+
+    def counting_parse(code):
+        calls.append(code)
+        return parse(code)
+
+    monkeypatch.setattr(utils, "parse", counting_parse)
+    yield calls
+    _parse_cache.clear()
+
+
+def test_parse_cache(parse_calls, monkeypatch):
+    trees = []
+
+    def recording_interpreter(tree):
+        trees.append(tree)
+        return Interpreter(tree)
+
+    monkeypatch.setattr(utils, "Interpreter", recording_interpreter)
+    code = "forward 1"
+    first, second = run(code), run(code)
+    assert parse_calls == [code]
+    assert trees[0] is trees[1]
+    assert list(first) == list(second) == [{"name": "forward", "value": 1.0}]
+
+
+def test_parse_cache_eviction(parse_calls):
+    for i in range(_PARSE_CACHE_SIZE + 1):
+        run(f"forward {i}")
+    run("forward 0")
+    assert parse_calls.count("forward 0") == 2  # noqa: PLR2004
+
+
+def test_parse_cache_long_code(parse_calls):
+    code = "forward 1 " * 5000
+    run(code)
+    run(code)
+    assert parse_calls == [code, code]
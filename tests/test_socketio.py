@@ -1,6 +1,16 @@
+import time
+
+import eventlet
 import pytest
 
 from python_logo import create_app, socketio
+from python_logo.events import _BATCH_SIZE, _QUEUE_SIZE
+
+COMMANDS_NUM = 100
+LONG_COMMANDS_NUM = 100000
+ENDLESS_COMMANDS_NUM = 100000000
+HEAVY_COMMANDS_NUM = 150
+HEAVY_COMMAND_COST = 20000
 
 
 @pytest.fixture
@@ -22,7 +32,97 @@ def test_run(client):
     received = client.get_received()
     assert received[0]["name"] == "task"
     assert received[0]["args"][0] == {"status": "running"}
-    assert received[1]["name"] == "execute"
-    assert received[1]["args"][0] == {"name": "forward", "value": 100}
+    assert received[1]["name"] == "execute_batch"
+    assert received[1]["args"][0] == [{"name": "forward", "value": 100}]
     assert received[2]["name"] == "task"
     assert received[2]["args"][0] == {"status": "done"}
+
+
+def test_run_batches(client):
+    client.emit("run", f"repeat {COMMANDS_NUM} [fd 1]")
+    received = client.get_received()
+    batches = [r["args"][0] for r in received if r["name"] == "execute_batch"]
+    assert all(len(batch) <= _BATCH_SIZE for batch in batches)
+    assert sum(len(batch) for batch in batches) == COMMANDS_NUM
+    assert received[-1]["args"][0] == {"status": "done"}
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "fd :size",
+        "fd 1 / 0",
+        "setpencolor pink",
+        "to f :x fd 1 / :x end f 0",
+    ],
+)
+def test_run_failed(client, code):
+    client.emit("run", code)
+    received = client.get_received()
+    assert received[-1]["name"] == "task"
+    assert received[-1]["args"][0]["status"] == "failed"
+
+
+def test_stop(client):
+    runner = eventlet.spawn(client.emit, "run", f"repeat {LONG_COMMANDS_NUM} [fd 1]")
+    eventlet.sleep(0.05)
+    client.emit("stop")
+    with eventlet.Timeout(5):
+        runner.wait()
+    received = client.get_received()
+    names = [r["name"] for r in received]
+    statuses = [r["args"][0] for r in received if r["name"] == "task"]
+    assert statuses.count({"status": "done"}) == 1
+    done_index = next(
+        i for i, r in enumerate(received) if r["args"][0] == {"status": "done"}
+    )
+    assert "execute_batch" in names[:done_index]
+    assert "execute_batch" not in names[done_index:]
+    batches = [r["args"][0] for r in received if r["name"] == "execute_batch"]
+    assert sum(len(batch) for batch in batches) < LONG_COMMANDS_NUM
+
+
+def test_stop_compute_heavy(client):
+    assert HEAVY_COMMANDS_NUM < _QUEUE_SIZE
+    code = f"repeat {HEAVY_COMMANDS_NUM} [repeat {HEAVY_COMMAND_COST} [make a 1] fd 1]"
+    started = time.monotonic()
+    client.emit("run", code)
+    full_duration = time.monotonic() - started
+    client.get_received()
+
+    started = time.monotonic()
+    runner = eventlet.spawn(client.emit, "run", code)
+    eventlet.sleep(0.05)
+    client.emit("stop")
+    with eventlet.Timeout(5):
+        runner.wait()
+    assert time.monotonic() - started < full_duration / 2
+    received = client.get_received()
+    statuses = [r["args"][0] for r in received if r["name"] == "task"]
+    assert statuses.count({"status": "done"}) == 1
+
+
+def test_disconnect_stops_task():
+    app = create_app()
+    app.config["TESTING"] = True
+    client = socketio.test_client(app)
+    runner = eventlet.spawn(client.emit, "run", f"repeat {ENDLESS_COMMANDS_NUM} [fd 1]")
+    eventlet.sleep(0.05)
+    client.disconnect()
+    with eventlet.Timeout(5):
+        runner.wait()
+
+
+def test_second_run_stops_first():
+    app = create_app()
+    app.config["TESTING"] = True
+    client = socketio.test_client(app)
+    code = f"repeat {ENDLESS_COMMANDS_NUM} [fd 1]"
+    first = eventlet.spawn(client.emit, "run", code)
+    eventlet.sleep(0.05)
+    second = eventlet.spawn(client.emit, "run", code)
+    eventlet.sleep(0.05)
+    client.disconnect()
+    with eventlet.Timeout(5):
+        first.wait()
+        second.wait()